@@ -12,10 +12,25 @@ Usage:
     python scripts/validate_examples.py
 """
 
+import io
+import json
+import os
 import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
 
-from dogonnet.utils.jsonnet import compile_jsonnet
+from dogonnet.utils.jsonnet import compile_jsonnet_str
+
+# Optional: stream-validate with constant memory instead of materializing dicts
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+
+# Validation rules, hoisted so each check is a single C-level set operation
+_REQUIRED_FIELDS = frozenset({"title", "widgets", "layout_type"})
+_VALID_LAYOUTS = frozenset({"ordered", "grid"})
 
 
 def validate_dashboard_json(dashboard: dict, filename: str) -> list[str]:
@@ -25,34 +40,114 @@ def validate_dashboard_json(dashboard: dict, filename: str) -> list[str]:
     """
     errors = []
 
-    # Required top-level fields
-    if "title" not in dashboard:
-        errors.append(f"{filename}: Missing required field 'title'")
-    if "widgets" not in dashboard:
-        errors.append(f"{filename}: Missing required field 'widgets'")
-    if "layout_type" not in dashboard:
-        errors.append(f"{filename}: Missing required field 'layout_type'")
+    # Required top-level fields (one set difference instead of three lookups)
+    for field in sorted(_REQUIRED_FIELDS - dashboard.keys()):
+        errors.append(f"{filename}: Missing required field '{field}'")
 
     # Validate types
     if "widgets" in dashboard and not isinstance(dashboard["widgets"], list):
         errors.append(f"{filename}: 'widgets' must be a list")
 
-    if "layout_type" in dashboard and dashboard["layout_type"] not in ["ordered", "grid"]:
+    if "layout_type" in dashboard and dashboard["layout_type"] not in _VALID_LAYOUTS:
         errors.append(f"{filename}: 'layout_type' must be 'ordered' or 'grid'")
 
-    # Validate widgets
-    if "widgets" in dashboard:
-        for i, widget in enumerate(dashboard["widgets"]):
-            if not isinstance(widget, dict):
-                errors.append(f"{filename}: Widget {i} is not a dictionary")
-                continue
-
-            if "definition" not in widget:
-                errors.append(f"{filename}: Widget {i} missing 'definition'")
+    # Validate widgets in one generator pass. type(w) is dict is an identity
+    # check (JSON decoding only ever produces plain dicts), skipping
+    # isinstance's MRO walk per element.
+    widgets = dashboard.get("widgets")
+    if isinstance(widgets, list):
+        errors.extend(
+            f"{filename}: Widget {i} is not a dictionary"
+            if type(widget) is not dict
+            else f"{filename}: Widget {i} missing 'definition'"
+            for i, widget in enumerate(widgets)
+            if type(widget) is not dict or "definition" not in widget
+        )
 
     return errors
 
 
+def stream_validate_dashboard(json_bytes: bytes, filename: str) -> tuple[list[str], dict]:
+    """Validate dashboard JSON in a single streaming pass (requires ijson).
+
+    Applies the same rules as validate_dashboard_json without ever materializing
+    the widget dicts, so memory stays constant regardless of dashboard size.
+
+    Returns (errors, summary) where summary holds title/layout_type/widget_count.
+    """
+    errors = []
+    seen_keys = set()
+    summary = {"title": None, "layout_type": None, "widget_count": 0}
+    widget_index = -1
+    in_widget_map = False
+    widget_has_definition = False
+    widgets_not_list_reported = False
+
+    for prefix, event, value in ijson.parse(io.BytesIO(json_bytes)):
+        if prefix == "" and event == "map_key":
+            seen_keys.add(value)
+        elif prefix == "title":
+            summary["title"] = value
+        elif prefix == "layout_type":
+            summary["layout_type"] = value
+            if value not in _VALID_LAYOUTS:
+                errors.append(f"{filename}: 'layout_type' must be 'ordered' or 'grid'")
+        elif prefix == "widgets" and event not in ("start_array", "end_array"):
+            # A non-list value emits several parse events at this prefix
+            # (start_map, each map_key, end_map); report only the first
+            if not widgets_not_list_reported:
+                widgets_not_list_reported = True
+                errors.append(f"{filename}: 'widgets' must be a list")
+        elif prefix == "widgets.item":
+            if event == "start_map":
+                widget_index += 1
+                in_widget_map = True
+                widget_has_definition = False
+            elif event == "end_map":
+                in_widget_map = False
+                summary["widget_count"] += 1
+                if not widget_has_definition:
+                    errors.append(f"{filename}: Widget {widget_index} missing 'definition'")
+            elif event == "map_key":
+                if value == "definition":
+                    widget_has_definition = True
+            elif not in_widget_map and event in ("string", "number", "boolean", "null", "start_array"):
+                # A scalar or nested array at widget position is not a widget object
+                widget_index += 1
+                summary["widget_count"] += 1
+                errors.append(f"{filename}: Widget {widget_index} is not a dictionary")
+
+    for field in sorted(_REQUIRED_FIELDS - seen_keys):
+        errors.append(f"{filename}: Missing required field '{field}'")
+
+    return errors, summary
+
+
+def _compile_and_validate(jsonnet_file: Path) -> tuple[str, dict | None, list[str], str | None]:
+    """Compile and validate a single example file (runs in a worker process).
+
+    Returns (filename, summary_or_None, validation_errors, exception_str_or_None).
+    The summary holds title/layout_type/widget_count for reporting.
+    """
+    filename = jsonnet_file.name
+    try:
+        json_str = compile_jsonnet_str(jsonnet_file)
+    except Exception as e:
+        return filename, None, [], str(e)
+
+    if ijson is not None:
+        errors, summary = stream_validate_dashboard(json_str.encode(), filename)
+    else:
+        dashboard = json.loads(json_str)
+        errors = validate_dashboard_json(dashboard, filename)
+        summary = {
+            "title": dashboard.get("title"),
+            "layout_type": dashboard.get("layout_type"),
+            "widget_count": len(dashboard.get("widgets", [])) if isinstance(dashboard.get("widgets"), list) else 0,
+        }
+    return filename, summary, errors, None
+
+
 def main():
     """Main validation logic."""
     examples_dir = Path("examples")
@@ -61,8 +156,17 @@ def main():
         print(f"Error: {examples_dir} directory not found")
         return 1
 
-    # Find all .jsonnet files
-    jsonnet_files = sorted(examples_dir.glob("*.jsonnet"))
+    # Find all .jsonnet files. scandir reuses the directory read for the
+    # is_file check, avoiding glob's per-entry fnmatch and stat calls.
+    with os.scandir(examples_dir) as it:
+        jsonnet_files = sorted(
+            (
+                Path(entry.path)
+                for entry in it
+                if entry.is_file(follow_symlinks=False) and entry.name.endswith(".jsonnet")
+            ),
+            key=lambda p: p.name,
+        )
 
     if not jsonnet_files:
         print(f"Warning: No .jsonnet files found in {examples_dir}")
@@ -77,42 +181,48 @@ def main():
     total_widgets = 0
     all_errors = []
 
+    # Jsonnet evaluation is CPU-bound and each file is independent, so fan the
+    # compilations out across cores and report once everything has completed.
+    outcomes = {}
+    with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+        futures = [executor.submit(_compile_and_validate, jsonnet_file) for jsonnet_file in jsonnet_files]
+        for future in as_completed(futures):
+            filename, summary, errors, exception_str = future.result()
+            outcomes[filename] = (summary, errors, exception_str)
+
+    # Emit in file order so output stays deterministic regardless of completion order
     for jsonnet_file in jsonnet_files:
         filename = jsonnet_file.name
-        try:
-            # Compile
-            result = compile_jsonnet(jsonnet_file)
-
-            # Validate
-            errors = validate_dashboard_json(result, filename)
-
-            if errors:
-                print(f"✗ {filename}")
-                for error in errors:
-                    print(f"  - {error}")
-                    all_errors.append(error)
-                print()
-                continue
-
-            # Success!
-            title = result.get("title", "No title")
-            widget_count = len(result.get("widgets", []))
-            layout = result.get("layout_type", "unknown")
-
-            print(f"✓ {filename}")
-            print(f"  Title:   {title}")
-            print(f"  Layout:  {layout}")
-            print(f"  Widgets: {widget_count}")
-            print()
+        summary, errors, exception_str = outcomes[filename]
 
-            success_count += 1
-            total_widgets += widget_count
+        if exception_str is not None:
+            print(f"✗ {filename}")
+            print(f"  Compilation Error: {exception_str[:500]}")
+            print()
+            all_errors.append(f"{filename}: {exception_str}")
+            continue
 
-        except Exception as e:
+        if errors:
             print(f"✗ {filename}")
-            print(f"  Compilation Error: {str(e)[:500]}")
+            for error in errors:
+                print(f"  - {error}")
+                all_errors.append(error)
             print()
-            all_errors.append(f"{filename}: {str(e)}")
+            continue
+
+        # Success!
+        title = summary.get("title") or "No title"
+        widget_count = summary.get("widget_count", 0)
+        layout = summary.get("layout_type") or "unknown"
+
+        print(f"✓ {filename}")
+        print(f"  Title:   {title}")
+        print(f"  Layout:  {layout}")
+        print(f"  Widgets: {widget_count}")
+        print()
+
+        success_count += 1
+        total_widgets += widget_count
 
     # Summary
     print("=" * 70)
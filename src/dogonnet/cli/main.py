@@ -1,17 +1,38 @@
 """dogonnet CLI - Datadog dashboard management with Jsonnet."""
 
-import json
+import contextlib
+import functools
 import sys
 from pathlib import Path
+from typing import TYPE_CHECKING, Any
 
 import click
-from rich.console import Console
-from rich.table import Table
 
-from dogonnet.client import DatadogDashboardClient
-from dogonnet.utils.jsonnet import compile_jsonnet, is_jsonnet_file, load_dashboard
+from dogonnet.utils.jsonnet import compile_dashboard, dumps_json, is_jsonnet_file, load_dashboard
 
-console = Console()
+if TYPE_CHECKING:
+    from rich.console import Console
+
+# rich and the Datadog client are imported lazily inside the commands that use
+# them, so local-only invocations (compile, --help) skip their import cost.
+
+
+@functools.cache
+def _console() -> "Console":
+    from rich.console import Console
+
+    return Console()
+
+
+def _status(message: str) -> contextlib.AbstractContextManager[Any]:
+    """Live status spinner, skipped when stdout is not a terminal (e.g. CI logs).
+
+    rich's status spawns a live-render thread and per-frame ANSI encoding that
+    is pure overhead when nobody is watching.
+    """
+    if sys.stdout.isatty():
+        return _console().status(message)
+    return contextlib.nullcontext()
 
 
 @click.group()
@@ -37,34 +58,110 @@ def push(source: Path, dry_run: bool, api_key: str | None, app_key: str | None,
     """
     try:
         # Load dashboard
-        with console.status(f"Loading {source.name}..."):
+        with _status(f"Loading {source.name}..."):
             dashboard_json = load_dashboard(source)
 
         title = dashboard_json.get("title", "Unknown")
         dashboard_id = dashboard_json.get("id")
 
         # Create client
+        from dogonnet.client import DatadogDashboardClient
+
         client = DatadogDashboardClient(api_key=api_key, app_key=app_key, site=site)
 
         if dry_run:
             if dashboard_id and client.dashboard_exists(dashboard_id):
-                console.print(f"[yellow][DRY RUN] Would UPDATE: {title} (ID: {dashboard_id})[/yellow]")
+                _console().print(f"[yellow][DRY RUN] Would UPDATE: {title} (ID: {dashboard_id})[/yellow]")
             else:
-                console.print(f"[yellow][DRY RUN] Would CREATE: {title}[/yellow]")
+                _console().print(f"[yellow][DRY RUN] Would CREATE: {title}[/yellow]")
             return
 
         # Push dashboard
-        with console.status(f"Pushing {title}..."):
+        with _status(f"Pushing {title}..."):
             if dashboard_id and client.dashboard_exists(dashboard_id):
                 result = client.update_dashboard(dashboard_id, dashboard_json)
-                console.print(f"[green]✓ Updated: {title} (ID: {dashboard_id})[/green]")
+                _console().print(f"[green]✓ Updated: {title} (ID: {dashboard_id})[/green]")
             else:
                 result = client.create_dashboard(dashboard_json)
                 new_id = result.get("id", "unknown")
-                console.print(f"[green]✓ Created: {title} (ID: {new_id})[/green]")
+                _console().print(f"[green]✓ Created: {title} (ID: {new_id})[/green]")
 
     except Exception as e:
-        console.print(f"[red]✗ Error: {e}[/red]")
+        _console().print(f"[red]✗ Error: {e}[/red]")
+        sys.exit(1)
+
+
+@main.command("push-all")
+@click.argument("directory", type=click.Path(exists=True, file_okay=False, path_type=Path))
+@click.option("--dry-run", is_flag=True, help="Validate without pushing")
+@click.option("--concurrency", default=8, show_default=True, help="Maximum concurrent pushes")
+@click.option("--api-key", envvar="DD_API_KEY", help="Datadog API key")
+@click.option("--app-key", envvar="DD_APP_KEY", help="Datadog application key")
+@click.option("--site", envvar="DD_SITE", default="datadoghq.com", help="Datadog site")
+def push_all(
+    directory: Path, dry_run: bool, concurrency: int, api_key: str | None, app_key: str | None, site: str
+) -> None:
+    """Push every dashboard in DIRECTORY to Datadog.
+
+    Dashboards are compiled locally, then pushed over a shared session with
+    up to --concurrency requests in flight, so deployment time is bounded by
+    the slowest batch of round-trips rather than their sum.
+    """
+    try:
+        sources = sorted(p for p in directory.iterdir() if is_jsonnet_file(p) or p.suffix == ".json")
+        if not sources:
+            _console().print(f"[yellow]No dashboard files found in {directory}[/yellow]")
+            return
+
+        with _status(f"Loading {len(sources)} dashboards..."):
+            dashboards = [(source, load_dashboard(source)) for source in sources]
+
+        from dogonnet.client import DatadogDashboardClient
+
+        client = DatadogDashboardClient(api_key=api_key, app_key=app_key, site=site)
+
+        if dry_run:
+            for source, dashboard_json in dashboards:
+                title = dashboard_json.get("title", "Unknown")
+                _console().print(f"[yellow][DRY RUN] Would push: {title} ({source.name})[/yellow]")
+            return
+
+        def _push_one(dashboard_json: dict) -> str:
+            title = dashboard_json.get("title", "Unknown")
+            dashboard_id = dashboard_json.get("id")
+            if dashboard_id and client.dashboard_exists(dashboard_id):
+                client.update_dashboard(dashboard_id, dashboard_json)
+                return f"[green]✓ Updated: {title} (ID: {dashboard_id})[/green]"
+            result = client.create_dashboard(dashboard_json)
+            return f"[green]✓ Created: {title} (ID: {result.get('id', 'unknown')})[/green]"
+
+        from concurrent.futures import ThreadPoolExecutor
+
+        failures = 0
+        with _status(f"Pushing {len(dashboards)} dashboards..."):
+            with ThreadPoolExecutor(max_workers=concurrency) as executor:
+                futures = [
+                    (source, executor.submit(_push_one, dashboard_json)) for source, dashboard_json in dashboards
+                ]
+                # Report in source order so output stays deterministic
+                results = []
+                for source, future in futures:
+                    try:
+                        results.append(future.result())
+                    except Exception as e:
+                        failures += 1
+                        results.append(f"[red]✗ {source.name}: {e}[/red]")
+
+        for line in results:
+            _console().print(line)
+
+        if failures:
+            _console().print(f"\n[red]{failures}/{len(dashboards)} dashboards failed[/red]")
+            sys.exit(1)
+        _console().print(f"\n[green]Pushed {len(dashboards)} dashboards[/green]")
+
+    except Exception as e:
+        _console().print(f"[red]✗ Error: {e}[/red]")
         sys.exit(1)
 
 
@@ -80,22 +177,24 @@ def fetch(dashboard_id: str, output: Path | None, api_key: str | None, app_key:
     DASHBOARD_ID is the Datadog dashboard ID.
     """
     try:
+        from dogonnet.client import DatadogDashboardClient
+
         client = DatadogDashboardClient(api_key=api_key, app_key=app_key, site=site)
 
-        with console.status(f"Fetching dashboard {dashboard_id}..."):
+        with _status(f"Fetching dashboard {dashboard_id}..."):
             dashboard_json = client.get_dashboard(dashboard_id)
 
         # Output
-        json_str = json.dumps(dashboard_json, indent=2)
+        json_str = dumps_json(dashboard_json)
 
         if output:
             output.write_text(json_str)
-            console.print(f"[green]✓ Saved to {output}[/green]")
+            _console().print(f"[green]✓ Saved to {output}[/green]")
         else:
-            console.print(json_str)
+            _console().print(json_str)
 
     except Exception as e:
-        console.print(f"[red]✗ Error: {e}[/red]")
+        _console().print(f"[red]✗ Error: {e}[/red]")
         sys.exit(1)
 
 
@@ -111,6 +210,8 @@ def delete(dashboard_id: str, yes: bool, api_key: str | None, app_key: str | Non
     DASHBOARD_ID is the Datadog dashboard ID.
     """
     try:
+        from dogonnet.client import DatadogDashboardClient
+
         client = DatadogDashboardClient(api_key=api_key, app_key=app_key, site=site)
 
         # Get dashboard title for confirmation
@@ -119,16 +220,16 @@ def delete(dashboard_id: str, yes: bool, api_key: str | None, app_key: str | Non
 
         if not yes:
             if not click.confirm(f"Delete dashboard '{title}' (ID: {dashboard_id})?"):
-                console.print("[yellow]Cancelled[/yellow]")
+                _console().print("[yellow]Cancelled[/yellow]")
                 return
 
-        with console.status(f"Deleting {title}..."):
+        with _status(f"Deleting {title}..."):
             client.delete_dashboard(dashboard_id)
 
-        console.print(f"[green]✓ Deleted: {title}[/green]")
+        _console().print(f"[green]✓ Deleted: {title}[/green]")
 
     except Exception as e:
-        console.print(f"[red]✗ Error: {e}[/red]")
+        _console().print(f"[red]✗ Error: {e}[/red]")
         sys.exit(1)
 
 
@@ -139,12 +240,16 @@ def delete(dashboard_id: str, yes: bool, api_key: str | None, app_key: str | Non
 def list(api_key: str | None, app_key: str | None, site: str):
     """List all dashboards in Datadog."""
     try:
+        from dogonnet.client import DatadogDashboardClient
+
         client = DatadogDashboardClient(api_key=api_key, app_key=app_key, site=site)
 
-        with console.status("Fetching dashboards..."):
+        with _status("Fetching dashboards..."):
             dashboards = client.list_dashboards()
 
         # Create table
+        from rich.table import Table
+
         table = Table(title="Datadog Dashboards")
         table.add_column("ID", style="cyan")
         table.add_column("Title", style="green")
@@ -153,11 +258,11 @@ def list(api_key: str | None, app_key: str | None, site: str):
         for dashboard in dashboards:
             table.add_row(dashboard.get("id", ""), dashboard.get("title", ""), dashboard.get("url", ""))
 
-        console.print(table)
-        console.print(f"\n[green]Total: {len(dashboards)} dashboards[/green]")
+        _console().print(table)
+        _console().print(f"\n[green]Total: {len(dashboards)} dashboards[/green]")
 
     except Exception as e:
-        console.print(f"[red]✗ Error: {e}[/red]")
+        _console().print(f"[red]✗ Error: {e}[/red]")
         sys.exit(1)
 
 
@@ -171,22 +276,21 @@ def compile(source: Path, output: Path | None):
     """
     try:
         if not is_jsonnet_file(source):
-            console.print(f"[red]✗ Error: {source} is not a Jsonnet file[/red]")
+            _console().print(f"[red]✗ Error: {source} is not a Jsonnet file[/red]")
             sys.exit(1)
 
-        with console.status(f"Compiling {source.name}..."):
-            dashboard_json = compile_jsonnet(source)
-
-        json_str = json.dumps(dashboard_json, indent=2)
+        with _status(f"Compiling {source.name}..."):
+            compiled = compile_dashboard(source)
 
+        # Write/print the raw compiled JSON; no dict round-trip needed
         if output:
-            output.write_text(json_str)
-            console.print(f"[green]✓ Compiled to {output}[/green]")
+            output.write_text(compiled.json_str)
+            _console().print(f"[green]✓ Compiled to {output}[/green]")
         else:
-            console.print(json_str)
+            _console().print(compiled.json_str)
 
     except Exception as e:
-        console.print(f"[red]✗ Error: {e}[/red]")
+        _console().print(f"[red]✗ Error: {e}[/red]")
         sys.exit(1)
 
 
@@ -198,31 +302,31 @@ def view(source: Path):
     SOURCE can be a .jsonnet or .json file.
     """
     try:
-        with console.status(f"Loading {source.name}..."):
+        with _status(f"Loading {source.name}..."):
             dashboard_json = load_dashboard(source)
 
         # Display dashboard info
-        console.print("\n[bold]Dashboard Preview[/bold]")
-        console.print(f"[cyan]Title:[/cyan] {dashboard_json.get('title', 'Unknown')}")
-        console.print(f"[cyan]Description:[/cyan] {dashboard_json.get('description', 'N/A')}")
+        _console().print("\n[bold]Dashboard Preview[/bold]")
+        _console().print(f"[cyan]Title:[/cyan] {dashboard_json.get('title', 'Unknown')}")
+        _console().print(f"[cyan]Description:[/cyan] {dashboard_json.get('description', 'N/A')}")
 
         layout = dashboard_json.get("layout_type", "Unknown")
-        console.print(f"[cyan]Layout:[/cyan] {layout}")
+        _console().print(f"[cyan]Layout:[/cyan] {layout}")
 
         widgets = dashboard_json.get("widgets", [])
-        console.print(f"[cyan]Widgets:[/cyan] {len(widgets)}")
+        _console().print(f"[cyan]Widgets:[/cyan] {len(widgets)}")
 
         # Display widget summary
         if widgets:
-            console.print("\n[bold]Widget Summary:[/bold]")
+            _console().print("\n[bold]Widget Summary:[/bold]")
             for i, widget in enumerate(widgets, 1):
                 definition = widget.get("definition", {})
                 widget_type = definition.get("type", "unknown")
                 widget_title = definition.get("title", "Untitled")
-                console.print(f"  {i}. [{widget_type}] {widget_title}")
+                _console().print(f"  {i}. [{widget_type}] {widget_title}")
 
     except Exception as e:
-        console.print(f"[red]✗ Error: {e}[/red]")
+        _console().print(f"[red]✗ Error: {e}[/red]")
         sys.exit(1)
 
 
@@ -1,17 +1,29 @@
 """Datadog Dashboard API client for dashboard CRUD operations."""
 
+import functools
 import logging
 import os
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 logger = logging.getLogger(__name__)
 
+# Server-generated fields that must not be sent back on create/update
+_STRIP_FIELDS = frozenset({"id", "url", "created_at", "modified_at", "author_handle", "author_name"})
 
+
+@functools.lru_cache(maxsize=1)
 def get_datadog_credentials() -> tuple[str, str, str]:
     """Get Datadog credentials from environment.
 
+    The result is cached, so repeated client constructions skip the
+    os.environ lookups. Call get_datadog_credentials.cache_clear() if the
+    environment changes at runtime.
+
     Returns:
         Tuple of (api_key, app_key, site)
 
@@ -55,7 +67,12 @@ class DatadogDashboardClient:
         self._session = self._create_session()
 
     def _create_session(self) -> requests.Session:
-        """Create authenticated session for Datadog API."""
+        """Create authenticated session for Datadog API.
+
+        Mounts a pooled adapter so bulk flows (list, then get each) reuse one
+        TLS connection instead of paying a handshake per request, and retries
+        transient failures with backoff.
+        """
         session = requests.Session()
         session.headers.update(
             {
@@ -64,6 +81,19 @@ class DatadogDashboardClient:
                 "Content-Type": "application/json",
             }
         )
+        adapter = HTTPAdapter(
+            pool_connections=1,  # every request targets the same host
+            pool_maxsize=32,
+            max_retries=Retry(
+                total=3,
+                backoff_factor=0.2,
+                status_forcelist=(429, 500, 502, 503, 504),
+                # Idempotent verbs only: retrying a POST could duplicate a
+                # dashboard if the server committed the create before failing
+                allowed_methods=frozenset({"GET", "HEAD", "PUT", "DELETE"}),
+            ),
+        )
+        session.mount(f"https://api.{self.site}/", adapter)
         return session
 
     def list_dashboards(self) -> list[dict[str, Any]]:
@@ -92,6 +122,23 @@ class DatadogDashboardClient:
         response.raise_for_status()
         return response.json()
 
+    def batch_get_dashboards(self, dashboard_ids: list[str]) -> list[dict[str, Any]]:
+        """Fetch multiple dashboards concurrently.
+
+        Fans the GETs out over a thread pool sharing the pooled session
+        (requests sessions are thread-safe for reads with a single-adapter
+        pool), so wall time is bounded by the slowest batch of round-trips
+        rather than their sum.
+
+        Args:
+            dashboard_ids: Dashboard IDs to fetch
+
+        Returns:
+            Full dashboard JSON definitions, in the same order as dashboard_ids
+        """
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            return list(executor.map(self.get_dashboard, dashboard_ids))
+
     def dashboard_exists(self, dashboard_id: str) -> bool:
         """Check if a dashboard exists.
 
@@ -103,7 +150,8 @@ class DatadogDashboardClient:
         """
         url = f"{self.base_url}/v1/dashboard/{dashboard_id}"
         try:
-            response = self._session.get(url)
+            # HEAD: only the status code is needed, so skip the response body
+            response = self._session.head(url)
             return response.status_code == 200
         except requests.exceptions.RequestException:
             return False
@@ -120,9 +168,7 @@ class DatadogDashboardClient:
         url = f"{self.base_url}/v1/dashboard"
 
         # Remove fields that shouldn't be in create request
-        payload = dashboard_json.copy()
-        for field in ["id", "url", "created_at", "modified_at", "author_handle", "author_name"]:
-            payload.pop(field, None)
+        payload = {k: v for k, v in dashboard_json.items() if k not in _STRIP_FIELDS}
 
         response = self._session.post(url, json=payload)
         response.raise_for_status()
@@ -141,9 +187,7 @@ class DatadogDashboardClient:
         url = f"{self.base_url}/v1/dashboard/{dashboard_id}"
 
         # Remove fields that shouldn't be in update request
-        payload = dashboard_json.copy()
-        for field in ["id", "url", "created_at", "modified_at", "author_handle", "author_name"]:
-            payload.pop(field, None)
+        payload = {k: v for k, v in dashboard_json.items() if k not in _STRIP_FIELDS}
 
         response = self._session.put(url, json=payload)
         response.raise_for_status()
@@ -175,6 +219,9 @@ class DatadogDashboardClient:
         """
         url = f"{self.base_url}/v1/metrics"
         params = {"from": f"-{from_seconds}"}
+        if search:
+            # Push the filter to the server so only matching metrics cross the wire
+            params["q"] = search
 
         response = self._session.get(url, params=params)
         response.raise_for_status()
@@ -183,6 +230,7 @@ class DatadogDashboardClient:
         metrics = data.get("metrics", [])
 
         if search:
+            # Defensive second pass in case the server matched more loosely
             search_lower = search.lower()
             metrics = [m for m in metrics if search_lower in m.lower()]
 
@@ -1,5 +1,21 @@
 """Utility functions for dogonnet."""
 
-from dogonnet.utils.jsonnet import compile_jsonnet, is_jsonnet_file, load_dashboard
+from dogonnet.utils.jsonnet import (
+    CompiledDashboard,
+    compile_dashboard,
+    compile_jsonnet,
+    compile_jsonnet_str,
+    is_jsonnet_file,
+    load_dashboard,
+    prepare_jsonnet,
+)
 
-__all__ = ["compile_jsonnet", "is_jsonnet_file", "load_dashboard"]
+__all__ = [
+    "CompiledDashboard",
+    "compile_dashboard",
+    "compile_jsonnet",
+    "compile_jsonnet_str",
+    "is_jsonnet_file",
+    "load_dashboard",
+    "prepare_jsonnet",
+]
@@ -1,10 +1,325 @@
 """Jsonnet compilation utilities."""
 
+import functools
+import hashlib
 import json
+import os
 import subprocess
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any
 
+# Default import search path, resolved once at module load.
+# Examples use 'import "dogonnet/lib/main.libsonnet"', so the parent of the
+# dogonnet package directory has to be on the jpath.
+try:
+    import dogonnet as _dogonnet
+
+    _PKG_PARENT = Path(_dogonnet.__file__).parent.parent
+    _DEFAULT_JPATH: tuple[Path, ...] = (_PKG_PARENT,) if _PKG_PARENT.exists() else ()
+except (ImportError, AttributeError):
+    _DEFAULT_JPATH = ()
+
+# Prefer orjson (Rust, SIMD) for JSON parse/serialize when installed via the
+# 'perf' extra; fall back to the stdlib. orjson.JSONDecodeError subclasses
+# json.JSONDecodeError, so error handling is shared.
+try:
+    import orjson
+
+    def _json_loads(data: str | bytes) -> Any:
+        return orjson.loads(data)
+
+    def dumps_json(obj: Any) -> str:
+        """Serialize to a 2-space-indented JSON string."""
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode()
+
+except ImportError:
+
+    def _json_loads(data: str | bytes) -> Any:
+        return json.loads(data)
+
+    def dumps_json(obj: Any) -> str:
+        """Serialize to a 2-space-indented JSON string."""
+        return json.dumps(obj, indent=2)
+
+
+# Lazily resolved Jsonnet backend. None means not yet resolved; False means no
+# in-process binding is available and the CLI fallback must be used. Resolving
+# once on first use (rather than per call) skips the import cascade and the
+# ImportError construction on the hot compile path, while keeping module import
+# free of binding load cost for commands that never compile.
+_EVALUATE: Any = None
+_BACKEND_VERSION = "cli"
+
+
+def _resolve_backend() -> Any:
+    """Resolve the in-process Jsonnet binding once, on first use.
+
+    Returns the evaluate_file entrypoint of the first available binding, or
+    False when only the CLI fallback is usable.
+    """
+    global _EVALUATE, _BACKEND_VERSION
+    if _EVALUATE is None:
+        try:
+            import _jsonnet
+
+            _EVALUATE = _jsonnet.evaluate_file
+            _BACKEND_VERSION = str(getattr(_jsonnet, "version", "_jsonnet"))
+        except ImportError:
+            try:
+                import gojsonnet
+
+                _EVALUATE = gojsonnet.evaluate_file
+                _BACKEND_VERSION = str(getattr(gojsonnet, "version", "gojsonnet"))
+            except ImportError:
+                _EVALUATE = False
+                _BACKEND_VERSION = "cli"
+    return _EVALUATE
+
+
+# Serves import contents (widgets.libsonnet etc.) from memory so repeated
+# compilations in one process read each library from disk only once. Entries
+# hold (mtime_ns, bytes); a stat per hit revalidates them cheaply so
+# long-lived processes pick up edited libraries.
+_IMPORT_BYTES_CACHE: dict[str, tuple[int, bytes]] = {}
+
+
+def _make_import_callback(jpath_strs: list[str], imports: set[str] | None = None) -> Any:
+    """Build an import callback that caches library bytes in memory.
+
+    Supplying a callback replaces the backend's default importer, so the
+    callback also has to perform the jpath search itself: relative imports are
+    resolved against the importing file's directory first, then each jpath.
+
+    When an imports set is given, every resolved import path is recorded in it,
+    so callers can key caches on the files a compilation actually read.
+    """
+
+    def _import_callback(base: str, rel: str) -> tuple[str, bytes]:
+        if os.path.isabs(rel):
+            candidates = [rel]
+        else:
+            candidates = [os.path.join(base, rel)] + [os.path.join(p, rel) for p in jpath_strs]
+        for candidate in candidates:
+            full = os.path.normpath(candidate)
+            try:
+                mtime_ns = os.stat(full).st_mtime_ns
+            except OSError:
+                continue
+            hit = _IMPORT_BYTES_CACHE.get(full)
+            if hit is None or hit[0] != mtime_ns:
+                try:
+                    data = Path(full).read_bytes()
+                except OSError:
+                    continue
+                hit = _IMPORT_BYTES_CACHE[full] = (mtime_ns, data)
+            if imports is not None:
+                imports.add(full)
+            return full, hit[1]
+        raise RuntimeError(f"import not found: {rel}")
+
+    return _import_callback
+
+
+def _disk_cache_path(
+    source_file: Path,
+    ext_vars: dict[str, str] | None,
+    jpathdir: list[Path],
+) -> Path:
+    """Compute the on-disk cache location for a compilation.
+
+    The key hashes the source bytes, ext_vars, jpath entries, the mtimes of any
+    bundled .libsonnet libraries reachable through the jpath, and the backend
+    version. Imports resolved through the import callback are tracked
+    separately: each entry carries a sidecar of import mtimes that _deps_fresh
+    checks before the entry is served.
+    """
+    hasher = hashlib.sha256(source_file.read_bytes())
+    for key, value in sorted((ext_vars or {}).items()):
+        hasher.update(f"\0{key}={value}".encode())
+    for jpath in jpathdir:
+        hasher.update(f"\0{jpath}".encode())
+        lib_dir = Path(jpath) / "dogonnet" / "lib"
+        if lib_dir.is_dir():
+            for lib in sorted(lib_dir.glob("*.libsonnet")):
+                hasher.update(f"\0{lib.name}:{lib.stat().st_mtime_ns}".encode())
+    hasher.update(f"\0{_BACKEND_VERSION}".encode())
+
+    cache_dir = Path(os.environ.get("DOGONNET_CACHE", "~/.cache/dogonnet")).expanduser()
+    return cache_dir / f"{hasher.hexdigest()}.json"
+
+
+def _deps_path(disk_path: Path) -> Path:
+    """Sidecar file recording the imports a cached compilation depends on."""
+    return disk_path.with_suffix(".deps")
+
+
+def _deps_fresh(disk_path: Path) -> bool:
+    """Check that none of a cache entry's recorded imports have changed.
+
+    The sidecar maps each imported file to the mtime_ns observed when the
+    entry was written; a missing sidecar or any changed or deleted import
+    marks the entry stale.
+    """
+    try:
+        deps = _json_loads(_deps_path(disk_path).read_bytes())
+    except (OSError, json.JSONDecodeError):
+        return False
+    for path, mtime_ns in deps.items():
+        try:
+            if os.stat(path).st_mtime_ns != mtime_ns:
+                return False
+        except OSError:
+            return False
+    return True
+
+
+def _remember(disk_path: Path | None, json_str: str, imports: Iterable[str] = ()) -> None:
+    """Record a compilation result and its import mtimes in the on-disk cache."""
+    if disk_path is None:
+        return
+    try:
+        deps = {path: os.stat(path).st_mtime_ns for path in sorted(imports)}
+    except OSError:
+        # An import vanished mid-compile; don't cache a result we can't validate
+        return
+    try:
+        disk_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = disk_path.with_suffix(f".{os.getpid()}.tmp")
+        tmp_path.write_text(json_str)
+        os.replace(tmp_path, disk_path)
+        deps_tmp = disk_path.with_suffix(f".{os.getpid()}.deps.tmp")
+        deps_tmp.write_text(json.dumps(deps))
+        os.replace(deps_tmp, _deps_path(disk_path))
+    except OSError:
+        pass
+
+
+@functools.lru_cache(maxsize=128)
+def _compile_cached(
+    path_str: str,
+    mtime_ns: int,
+    ext_vars_items: tuple[tuple[str, str], ...],
+    jpath_tuple: tuple[str, ...],
+) -> str:
+    """Memoized compile keyed by (resolved path, mtime_ns, ext_vars, jpathdir).
+
+    Caches the raw JSON string (not the dict) so cached results stay immutable;
+    each hit pays only a json.loads, which is cheap compared to a full Jsonnet
+    parse+eval. mtime_ns in the key invalidates entries when the file changes.
+    """
+    return _compile_uncached(Path(path_str), dict(ext_vars_items), [Path(p) for p in jpath_tuple])
+
+
+def _compile_uncached(
+    source_file: Path,
+    ext_vars: dict[str, str] | None,
+    jpathdir: list[Path],
+) -> str:
+    """Compile without the in-memory cache: disk cache, then backend, then CLI."""
+    # Resolve the backend up front: _disk_cache_path keys on the backend version
+    evaluate = _resolve_backend()
+
+    # Check the on-disk cache, which survives across process starts (CI re-runs)
+    disk_path = None
+    try:
+        disk_path = _disk_cache_path(source_file, ext_vars, jpathdir)
+        if disk_path.exists() and _deps_fresh(disk_path):
+            return disk_path.read_text()
+    except OSError:
+        disk_path = None
+
+    # Use the in-process backend when one is installed (faster than the CLI)
+    if evaluate:
+        ext_vars = ext_vars or {}
+
+        # Convert Path objects to strings for the binding
+        jpath_strs = [str(p) for p in jpathdir]
+
+        # Record which files the compilation imports so the disk cache entry
+        # can be invalidated when any of them changes
+        imports: set[str] = set()
+        json_str: str = evaluate(
+            str(source_file),
+            ext_vars=ext_vars,
+            jpathdir=jpath_strs,
+            import_callback=_make_import_callback(jpath_strs, imports),
+        )
+        _remember(disk_path, json_str, imports)
+        return json_str
+
+    # Fall back to jsonnet CLI as a last resort
+    try:
+        # Build the argv in one pass: ext vars and jpath entries splat straight
+        # into the list, with no intermediate two-element lists to extend from
+        cmd = [
+            "jsonnet",
+            str(source_file),
+            *(arg for key, value in (ext_vars or {}).items() for arg in ("--ext-str", f"{key}={value}")),
+            *(arg for jpath in jpathdir for arg in ("-J", str(jpath))),
+        ]
+
+        # Binary pipes: the raw bytes are parsed for validation without an
+        # intermediate str, then decoded once as UTF-8 (Jsonnet output is
+        # always UTF-8, regardless of locale). stderr is decoded only on error.
+        result = subprocess.run(cmd, capture_output=True, check=True)
+        _json_loads(result.stdout)  # surface invalid CLI output as a RuntimeError below
+        stdout = result.stdout.decode("utf-8")
+        _remember(disk_path, stdout)
+        return stdout
+
+    except FileNotFoundError:
+        raise RuntimeError(
+            "Jsonnet compiler not found. Install with: pip install jsonnet (or gojsonnet)\n"
+            "Or install the jsonnet CLI from: https://github.com/google/go-jsonnet"
+        )
+    except subprocess.CalledProcessError as e:
+        stderr = e.stderr.decode("utf-8", errors="replace") if e.stderr else ""
+        raise RuntimeError(f"Jsonnet compilation failed:\n{stderr}")
+    except json.JSONDecodeError as e:
+        raise RuntimeError(f"Invalid JSON output from Jsonnet: {e}")
+
+
+def compile_jsonnet_str(
+    source_file: Path,
+    ext_vars: dict[str, str] | None = None,
+    jpathdir: list[Path] | None = None,
+) -> str:
+    """Compile a Jsonnet file to its raw JSON string.
+
+    Useful when the caller streams or writes the output without needing the
+    materialized dict, avoiding a full json.loads. Results for unchanged files
+    are served from an in-process LRU cache.
+
+    Args:
+        source_file: Path to Jsonnet file
+        ext_vars: External variables to pass to Jsonnet
+        jpathdir: List of directories to search for imports
+
+    Returns:
+        Compiled JSON as a string
+
+    Raises:
+        RuntimeError: If jsonnet compilation fails
+    """
+    # Add dogonnet library path to jpathdir
+    jpathdir = jpathdir or []
+    jpathdir = [p for p in _DEFAULT_JPATH if p not in jpathdir] + jpathdir
+
+    try:
+        mtime_ns = source_file.stat().st_mtime_ns
+    except OSError:
+        # Unstattable source (let the backend raise its own error): skip caching
+        return _compile_uncached(source_file, ext_vars, jpathdir)
+
+    return _compile_cached(
+        str(source_file.resolve()),
+        mtime_ns,
+        tuple(sorted((ext_vars or {}).items())),
+        tuple(str(p) for p in jpathdir),
+    )
+
 
 def compile_jsonnet(
     source_file: Path,
@@ -24,67 +339,93 @@ def compile_jsonnet(
     Raises:
         RuntimeError: If jsonnet compilation fails
     """
-    # Add dogonnet library path to jpathdir
-    jpathdir = jpathdir or []
+    return _json_loads(compile_jsonnet_str(source_file, ext_vars=ext_vars, jpathdir=jpathdir))
 
-    # Find the dogonnet package directory
-    # Examples use 'import "dogonnet/lib/main.libsonnet"'
-    # So we need to add the parent of the dogonnet package directory
-    try:
-        import dogonnet
 
-        package_dir = Path(dogonnet.__file__).parent  # /path/to/dogonnet
-        parent_dir = package_dir.parent  # /path/to/ (contains dogonnet/)
-        if parent_dir.exists() and parent_dir not in jpathdir:
-            jpathdir = [parent_dir] + jpathdir
-    except (ImportError, AttributeError):
-        pass
+@dataclass
+class CompiledDashboard:
+    """A compiled dashboard holding the raw JSON text and a lazy dict view.
 
-    # Try to use _jsonnet library first (faster)
-    try:
-        import _jsonnet
+    Callers that only write or stream the output use json_str and never pay
+    for parsing; callers that need the dict get it parsed (once) on demand.
+    """
 
-        ext_vars = ext_vars or {}
+    json_str: str
+    _data: dict[str, Any] | None = field(default=None, repr=False)
 
-        # Convert Path objects to strings for _jsonnet
-        jpath_strs = [str(p) for p in jpathdir]
+    @property
+    def data(self) -> dict[str, Any]:
+        """The parsed dashboard, computed on first access."""
+        if self._data is None:
+            self._data = _json_loads(self.json_str)
+        return self._data
 
-        json_str = _jsonnet.evaluate_file(str(source_file), ext_vars=ext_vars, jpathdir=jpath_strs)
-        return json.loads(json_str)
-    except ImportError:
-        pass
 
-    # Fall back to jsonnet CLI
-    try:
-        cmd = ["jsonnet", str(source_file)]
+def compile_dashboard(
+    source_file: Path,
+    ext_vars: dict[str, str] | None = None,
+    jpathdir: list[Path] | None = None,
+) -> CompiledDashboard:
+    """Compile a Jsonnet file to a CompiledDashboard.
 
-        # Add external variables
-        if ext_vars:
-            for key, value in ext_vars.items():
-                cmd.extend(["--ext-str", f"{key}={value}"])
+    Args:
+        source_file: Path to Jsonnet file
+        ext_vars: External variables to pass to Jsonnet
+        jpathdir: List of directories to search for imports
 
-        # Add jpath directories
-        if jpathdir:
-            for jpath in jpathdir:
-                cmd.extend(["-J", str(jpath)])
+    Returns:
+        CompiledDashboard wrapping the raw JSON and a lazy dict
 
-        result = subprocess.run(cmd, capture_output=True, text=True, check=True)
-        return json.loads(result.stdout)
+    Raises:
+        RuntimeError: If jsonnet compilation fails
+    """
+    return CompiledDashboard(compile_jsonnet_str(source_file, ext_vars=ext_vars, jpathdir=jpathdir))
 
-    except FileNotFoundError:
-        raise RuntimeError(
-            "Jsonnet compiler not found. Install with: pip install jsonnet\n"
-            "Or install the jsonnet CLI from: https://github.com/google/go-jsonnet"
-        )
-    except subprocess.CalledProcessError as e:
-        raise RuntimeError(f"Jsonnet compilation failed:\n{e.stderr}")
-    except json.JSONDecodeError as e:
-        raise RuntimeError(f"Invalid JSON output from Jsonnet: {e}")
+
+def prepare_jsonnet(
+    source_file: Path,
+    jpathdir: list[Path] | None = None,
+) -> Callable[[dict[str, str] | None], dict[str, Any]]:
+    """Prepare a template for repeated evaluation with varying ext_vars.
+
+    Resolves the import search path once up front; the returned callable
+    compiles the template with the given external variables. Evaluations share
+    the import byte cache, so the template's libraries are read from disk only
+    on the first call (parse once, evaluate many).
+
+    Args:
+        source_file: Path to Jsonnet file
+        jpathdir: List of directories to search for imports
+
+    Returns:
+        Callable taking ext_vars and returning the compiled dict
+    """
+    jpathdir = jpathdir or []
+    merged_jpath = [p for p in _DEFAULT_JPATH if p not in jpathdir] + jpathdir
+
+    def evaluate(ext_vars: dict[str, str] | None = None) -> dict[str, Any]:
+        return compile_jsonnet(source_file, ext_vars=ext_vars, jpathdir=merged_jpath)
+
+    return evaluate
+
+
+def _clear_caches() -> None:
+    """Drop cached compilation results and cached import bytes."""
+    _compile_cached.cache_clear()
+    _IMPORT_BYTES_CACHE.clear()
+
+
+compile_jsonnet.cache_clear = _clear_caches  # type: ignore[attr-defined]
+compile_jsonnet_str.cache_clear = _clear_caches  # type: ignore[attr-defined]
+
+
+_JSONNET_SUFFIXES: frozenset[str] = frozenset({".jsonnet", ".libsonnet"})
 
 
+@functools.lru_cache(maxsize=1024)
 def is_jsonnet_file(file_path: Path) -> bool:
     """Check if a file is a Jsonnet file based on extension."""
-    return file_path.suffix in [".jsonnet", ".libsonnet"]
+    return file_path.suffix in _JSONNET_SUFFIXES
 
 
 def load_dashboard(file_path: Path) -> dict[str, Any]:
@@ -99,5 +440,5 @@ def load_dashboard(file_path: Path) -> dict[str, Any]:
     if is_jsonnet_file(file_path):
         return compile_jsonnet(file_path)
     else:
-        with open(file_path) as f:
-            return json.load(f)
+        # Feed raw bytes straight to the parser; no intermediate str decode
+        return _json_loads(file_path.read_bytes())
@@ -1,25 +1,84 @@
 """Pytest configuration and fixtures."""
 
 from pathlib import Path
+from types import SimpleNamespace
 
 import pytest
 
+from dogonnet.client.dashboard import get_datadog_credentials
 
-@pytest.fixture
+
+@pytest.fixture(autouse=True)
+def isolated_compile_cache_dir(tmp_path, monkeypatch):
+    """Point the on-disk compile cache at a per-test directory."""
+    monkeypatch.setenv("DOGONNET_CACHE", str(tmp_path / "compile-cache"))
+
+
+@pytest.fixture(autouse=True)
+def clear_credentials_cache():
+    """Keep the cached credential lookup from leaking env state between tests."""
+    get_datadog_credentials.cache_clear()
+    yield
+    get_datadog_credentials.cache_clear()
+
+
+@pytest.fixture(scope="session")
 def example_dir():
     """Path to examples directory."""
     return Path(__file__).parent.parent / "examples"
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def basic_dashboard(example_dir):
     """Path to basic example dashboard."""
     return example_dir / "basic.jsonnet"
 
 
+@pytest.fixture(scope="session")
+def basic_dashboard_compiled(basic_dashboard, tmp_path_factory):
+    """The basic example dashboard compiled once for the whole session.
+
+    Tests that only assert on the compiled structure share this dict instead
+    of each paying for a Jsonnet parse+eval of the same file.
+    """
+    from dogonnet.utils.jsonnet import compile_jsonnet
+
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setenv("DOGONNET_CACHE", str(tmp_path_factory.mktemp("compile-cache")))
+        return compile_jsonnet(basic_dashboard)
+
+
+@pytest.fixture(scope="session")
+def cli():
+    """One CliRunner for the whole session; invoke() isolates I/O per call."""
+    from click.testing import CliRunner
+
+    return CliRunner()
+
+
 @pytest.fixture
-def mock_datadog_credentials(monkeypatch):
-    """Mock Datadog credentials for testing."""
-    monkeypatch.setenv("DD_API_KEY", "test_api_key")
-    monkeypatch.setenv("DD_APP_KEY", "test_app_key")
-    monkeypatch.setenv("DD_SITE", "datadoghq.com")
+def fake_response():
+    """Factory for lightweight HTTP response stand-ins.
+
+    SimpleNamespace only needs plain attribute access, skipping Mock's
+    per-attribute bookkeeping in tests that never assert on the response.
+    """
+
+    def _make(json_data=None, status_code=200):
+        return SimpleNamespace(json=lambda: json_data, status_code=status_code, raise_for_status=lambda: None)
+
+    return _make
+
+
+@pytest.fixture(scope="module")
+def mock_datadog_credentials():
+    """Mock Datadog credentials, set once per module instead of per test.
+
+    Tests that need a different environment (missing keys, custom DD_SITE)
+    override it with their own function-scoped monkeypatch.
+    """
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setenv("DD_API_KEY", "test_api_key")
+        mp.setenv("DD_APP_KEY", "test_app_key")
+        mp.setenv("DD_SITE", "datadoghq.com")
+        yield
@@ -6,6 +6,9 @@ import pytest
 
 from dogonnet.utils.jsonnet import compile_jsonnet
 
+# Shared preamble for the generated test dashboards
+WIDGETS_IMPORT = "local widgets = import 'dogonnet/lib/widgets.libsonnet';"
+
 
 @pytest.fixture
 def src_dir():
@@ -18,9 +21,9 @@ def test_all_38_widgets_compile(tmp_path, src_dir):
 
     # Create a comprehensive test dashboard with all widget types
     test_file = tmp_path / "all_widgets.jsonnet"
-    test_file.write_text("""
-    local widgets = import 'dogonnet/lib/widgets.libsonnet';
-
+    test_file.write_text(
+        WIDGETS_IMPORT
+        + """
     {
       title: 'All Widgets Test',
       layout_type: 'ordered',
@@ -82,7 +85,8 @@ def test_all_38_widgets_compile(tmp_path, src_dir):
         widgets.profilingFlameGraph('Flame Graph', 'runtime:python service:api'),
       ],
     }
-    """)
+    """
+    )
 
     # Compile and verify
     result = compile_jsonnet(test_file, jpathdir=[src_dir])
@@ -176,9 +180,9 @@ def test_individual_widget_compilation(tmp_path, src_dir, widget_type, widget_ca
     """Test that each individual widget type compiles correctly."""
 
     test_file = tmp_path / f"test_{widget_type}.jsonnet"
-    test_file.write_text(f"""
-    local widgets = import 'dogonnet/lib/widgets.libsonnet';
-
+    test_file.write_text(
+        WIDGETS_IMPORT
+        + f"""
     {{
       title: 'Test Dashboard',
       layout_type: 'ordered',
@@ -186,7 +190,8 @@ def test_individual_widget_compilation(tmp_path, src_dir, widget_type, widget_ca
         {widget_call}
       ],
     }}
-    """)
+    """
+    )
 
     result = compile_jsonnet(test_file, jpathdir=[src_dir])
 
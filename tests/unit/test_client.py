@@ -7,6 +7,14 @@ import requests
 
 from dogonnet.client.dashboard import DatadogDashboardClient, get_datadog_credentials
 
+BASE_URL = "https://api.datadoghq.com/api"
+
+
+@pytest.fixture(scope="module")
+def dd_client():
+    """One real client (and session) shared across the module; HTTP is intercepted per-test."""
+    return DatadogDashboardClient(api_key="test_key", app_key="test_app", site="datadoghq.com")
+
 
 def test_get_credentials_from_env(mock_datadog_credentials):
     """Test getting credentials from environment."""
@@ -65,104 +73,114 @@ def test_create_session():
     assert client._session.headers["Content-Type"] == "application/json"
 
 
-@patch("dogonnet.client.dashboard.requests.Session")
-def test_list_dashboards(mock_session_class):
-    """Test listing dashboards."""
-    # Setup mock
-    mock_session = Mock()
-    mock_response = Mock()
-    mock_response.json.return_value = {
-        "dashboards": [{"id": "dash-123", "title": "Test Dashboard 1"}, {"id": "dash-456", "title": "Test Dashboard 2"}]
-    }
-    mock_session.get.return_value = mock_response
-    mock_session_class.return_value = mock_session
-
-    client = DatadogDashboardClient(api_key="test_key", app_key="test_app", site="datadoghq.com")
-
-    dashboards = client.list_dashboards()
-
-    assert len(dashboards) == 2
-    assert dashboards[0]["id"] == "dash-123"
-    assert dashboards[1]["title"] == "Test Dashboard 2"
-    mock_session.get.assert_called_once_with("https://api.datadoghq.com/api/v1/dashboard")
-
-
-@patch("dogonnet.client.dashboard.requests.Session")
-def test_get_dashboard(mock_session_class):
-    """Test getting a specific dashboard."""
-    # Setup mock
-    mock_session = Mock()
-    mock_response = Mock()
-    mock_response.json.return_value = {"id": "dash-123", "title": "Test Dashboard", "widgets": []}
-    mock_session.get.return_value = mock_response
-    mock_session_class.return_value = mock_session
-
-    client = DatadogDashboardClient(api_key="test_key", app_key="test_app", site="datadoghq.com")
-
-    dashboard = client.get_dashboard("dash-123")
-
-    assert dashboard["id"] == "dash-123"
-    assert dashboard["title"] == "Test Dashboard"
-    mock_session.get.assert_called_once_with("https://api.datadoghq.com/api/v1/dashboard/dash-123")
-
-
-@patch("dogonnet.client.dashboard.requests.Session")
-def test_dashboard_exists_true(mock_session_class):
-    """Test checking if dashboard exists (returns True)."""
-    # Setup mock
-    mock_session = Mock()
-    mock_response = Mock()
-    mock_response.status_code = 200
-    mock_session.get.return_value = mock_response
-    mock_session_class.return_value = mock_session
-
+def test_create_session_has_adapter():
+    """Test that the session mounts a pooled adapter with retries."""
     client = DatadogDashboardClient(api_key="test_key", app_key="test_app", site="datadoghq.com")
 
-    exists = client.dashboard_exists("dash-123")
-
-    assert exists is True
-
-
-@patch("dogonnet.client.dashboard.requests.Session")
-def test_dashboard_exists_false(mock_session_class):
+    adapter = client._session.get_adapter("https://api.datadoghq.com/api/v1/dashboard")
+    assert adapter.max_retries.total == 3
+
+
+@pytest.mark.parametrize(
+    ("method", "args", "http_verb", "url", "response", "expected"),
+    [
+        (
+            "list_dashboards",
+            (),
+            "get",
+            f"{BASE_URL}/v1/dashboard",
+            {
+                "dashboards": [
+                    {"id": "dash-123", "title": "Test Dashboard 1"},
+                    {"id": "dash-456", "title": "Test Dashboard 2"},
+                ]
+            },
+            [{"id": "dash-123", "title": "Test Dashboard 1"}, {"id": "dash-456", "title": "Test Dashboard 2"}],
+        ),
+        (
+            "get_dashboard",
+            ("dash-123",),
+            "get",
+            f"{BASE_URL}/v1/dashboard/dash-123",
+            {"id": "dash-123", "title": "Test Dashboard", "widgets": []},
+            {"id": "dash-123", "title": "Test Dashboard", "widgets": []},
+        ),
+        (
+            "dashboard_exists",
+            ("dash-123",),
+            "head",
+            f"{BASE_URL}/v1/dashboard/dash-123",
+            {},
+            True,
+        ),
+        (
+            "delete_dashboard",
+            ("dash-123",),
+            "delete",
+            f"{BASE_URL}/v1/dashboard/dash-123",
+            {"deleted_dashboard_id": "dash-123"},
+            {"deleted_dashboard_id": "dash-123"},
+        ),
+        (
+            "get_metric_metadata",
+            ("system.cpu.user",),
+            "get",
+            f"{BASE_URL}/v1/metrics/system.cpu.user",
+            {"metric": "system.cpu.user", "type": "gauge", "description": "CPU usage"},
+            {"metric": "system.cpu.user", "type": "gauge", "description": "CPU usage"},
+        ),
+        (
+            "list_tags",
+            (),
+            "get",
+            f"{BASE_URL}/v1/tags/hosts",
+            {"tags": {"env": ["prod", "staging"], "service": ["web", "api"]}},
+            {"tags": {"env": ["prod", "staging"], "service": ["web", "api"]}},
+        ),
+    ],
+)
+def test_simple_endpoints(dd_client, requests_mock, method, args, http_verb, url, response, expected):
+    """Each simple endpoint hits its URL once and returns the parsed body."""
+    getattr(requests_mock, http_verb)(url, json=response)
+
+    result = getattr(dd_client, method)(*args)
+
+    assert result == expected
+    assert requests_mock.called_once
+
+
+def test_batch_get_dashboards(dd_client, requests_mock):
+    """Test fetching several dashboards concurrently."""
+    dashboard_ids = [f"dash-{i}" for i in range(5)]
+    for dashboard_id in dashboard_ids:
+        requests_mock.get(f"{BASE_URL}/v1/dashboard/{dashboard_id}", json={"id": dashboard_id})
+
+    dashboards = dd_client.batch_get_dashboards(dashboard_ids)
+
+    # Results come back in request order regardless of completion order
+    assert [d["id"] for d in dashboards] == dashboard_ids
+
+
+def test_dashboard_exists_false(dd_client, requests_mock):
     """Test checking if dashboard exists (returns False)."""
-    # Setup mock
-    mock_session = Mock()
-    mock_response = Mock()
-    mock_response.status_code = 404
-    mock_session.get.return_value = mock_response
-    mock_session_class.return_value = mock_session
-
-    client = DatadogDashboardClient(api_key="test_key", app_key="test_app", site="datadoghq.com")
-
-    exists = client.dashboard_exists("dash-999")
+    requests_mock.head(f"{BASE_URL}/v1/dashboard/dash-999", status_code=404)
 
-    assert exists is False
+    assert dd_client.dashboard_exists("dash-999") is False
 
 
-@patch("dogonnet.client.dashboard.requests.Session")
-def test_dashboard_exists_handles_exception(mock_session_class):
+def test_dashboard_exists_handles_exception(dd_client, requests_mock):
     """Test dashboard_exists handles exceptions gracefully."""
-    # Setup mock to raise exception
-    mock_session = Mock()
-    mock_session.get.side_effect = requests.exceptions.RequestException("Connection error")
-    mock_session_class.return_value = mock_session
-
-    client = DatadogDashboardClient(api_key="test_key", app_key="test_app", site="datadoghq.com")
+    requests_mock.head(f"{BASE_URL}/v1/dashboard/dash-123", exc=requests.exceptions.ConnectionError)
 
-    exists = client.dashboard_exists("dash-123")
-
-    assert exists is False
+    assert dd_client.dashboard_exists("dash-123") is False
 
 
 @patch("dogonnet.client.dashboard.requests.Session")
-def test_create_dashboard(mock_session_class):
+def test_create_dashboard(mock_session_class, fake_response):
     """Test creating a dashboard."""
     # Setup mock
     mock_session = Mock()
-    mock_response = Mock()
-    mock_response.json.return_value = {"id": "dash-new", "title": "New Dashboard"}
-    mock_session.post.return_value = mock_response
+    mock_session.post.return_value = fake_response({"id": "dash-new", "title": "New Dashboard"})
     mock_session_class.return_value = mock_session
 
     client = DatadogDashboardClient(api_key="test_key", app_key="test_app", site="datadoghq.com")
@@ -186,13 +204,11 @@ def test_create_dashboard(mock_session_class):
 
 
 @patch("dogonnet.client.dashboard.requests.Session")
-def test_update_dashboard(mock_session_class):
+def test_update_dashboard(mock_session_class, fake_response):
     """Test updating a dashboard."""
     # Setup mock
     mock_session = Mock()
-    mock_response = Mock()
-    mock_response.json.return_value = {"id": "dash-123", "title": "Updated Dashboard"}
-    mock_session.put.return_value = mock_response
+    mock_session.put.return_value = fake_response({"id": "dash-123", "title": "Updated Dashboard"})
     mock_session_class.return_value = mock_session
 
     client = DatadogDashboardClient(api_key="test_key", app_key="test_app", site="datadoghq.com")
@@ -214,97 +230,28 @@ def test_update_dashboard(mock_session_class):
     assert "author_handle" not in posted_json
 
 
-@patch("dogonnet.client.dashboard.requests.Session")
-def test_delete_dashboard(mock_session_class):
-    """Test deleting a dashboard."""
-    # Setup mock
-    mock_session = Mock()
-    mock_response = Mock()
-    mock_response.json.return_value = {"deleted_dashboard_id": "dash-123"}
-    mock_session.delete.return_value = mock_response
-    mock_session_class.return_value = mock_session
-
-    client = DatadogDashboardClient(api_key="test_key", app_key="test_app", site="datadoghq.com")
-
-    result = client.delete_dashboard("dash-123")
-
-    assert result["deleted_dashboard_id"] == "dash-123"
-    mock_session.delete.assert_called_once_with("https://api.datadoghq.com/api/v1/dashboard/dash-123")
-
-
-@patch("dogonnet.client.dashboard.requests.Session")
-def test_list_metrics(mock_session_class):
+def test_list_metrics(dd_client, requests_mock):
     """Test listing metrics."""
-    # Setup mock
-    mock_session = Mock()
-    mock_response = Mock()
-    mock_response.json.return_value = {"metrics": ["system.cpu.user", "system.mem.used", "app.requests"]}
-    mock_session.get.return_value = mock_response
-    mock_session_class.return_value = mock_session
-
-    client = DatadogDashboardClient(api_key="test_key", app_key="test_app", site="datadoghq.com")
+    requests_mock.get(
+        f"{BASE_URL}/v1/metrics", json={"metrics": ["system.cpu.user", "system.mem.used", "app.requests"]}
+    )
 
-    metrics = client.list_metrics()
+    metrics = dd_client.list_metrics()
 
     assert len(metrics) == 3
     assert "system.cpu.user" in metrics
     # Verify metrics are sorted
     assert metrics == sorted(metrics)
+    # Verify the lookback window was passed through
+    assert requests_mock.last_request.qs["from"] == ["-86400"]
 
 
-@patch("dogonnet.client.dashboard.requests.Session")
-def test_list_metrics_with_search(mock_session_class):
+def test_list_metrics_with_search(dd_client, requests_mock):
     """Test listing metrics with search filter."""
-    # Setup mock
-    mock_session = Mock()
-    mock_response = Mock()
-    mock_response.json.return_value = {"metrics": ["system.cpu.user", "system.mem.used", "app.requests"]}
-    mock_session.get.return_value = mock_response
-    mock_session_class.return_value = mock_session
-
-    client = DatadogDashboardClient(api_key="test_key", app_key="test_app", site="datadoghq.com")
-
-    metrics = client.list_metrics(search="system")
-
-    assert len(metrics) == 2
-    assert "system.cpu.user" in metrics
-    assert "system.mem.used" in metrics
-    assert "app.requests" not in metrics
-
-
-@patch("dogonnet.client.dashboard.requests.Session")
-def test_get_metric_metadata(mock_session_class):
-    """Test getting metric metadata."""
-    # Setup mock
-    mock_session = Mock()
-    mock_response = Mock()
-    mock_response.json.return_value = {"metric": "system.cpu.user", "type": "gauge", "description": "CPU usage"}
-    mock_session.get.return_value = mock_response
-    mock_session_class.return_value = mock_session
-
-    client = DatadogDashboardClient(api_key="test_key", app_key="test_app", site="datadoghq.com")
-
-    metadata = client.get_metric_metadata("system.cpu.user")
-
-    assert metadata["metric"] == "system.cpu.user"
-    assert metadata["type"] == "gauge"
-    mock_session.get.assert_called_once_with("https://api.datadoghq.com/api/v1/metrics/system.cpu.user")
-
-
-@patch("dogonnet.client.dashboard.requests.Session")
-def test_list_tags(mock_session_class):
-    """Test listing tags."""
-    # Setup mock
-    mock_session = Mock()
-    mock_response = Mock()
-    mock_response.json.return_value = {"tags": {"env": ["prod", "staging"], "service": ["web", "api"]}}
-    mock_session.get.return_value = mock_response
-    mock_session_class.return_value = mock_session
-
-    client = DatadogDashboardClient(api_key="test_key", app_key="test_app", site="datadoghq.com")
+    requests_mock.get(f"{BASE_URL}/v1/metrics", json={"metrics": ["system.cpu.user", "system.mem.used"]})
 
-    tags = client.list_tags()
+    metrics = dd_client.list_metrics(search="system")
 
-    assert "tags" in tags
-    assert tags["tags"]["env"] == ["prod", "staging"]
-    mock_session.get.assert_called_once_with("https://api.datadoghq.com/api/v1/tags/hosts")
+    assert metrics == ["system.cpu.user", "system.mem.used"]
+    # Verify the filter was pushed down to the server
+    assert requests_mock.last_request.qs["q"] == ["system"]
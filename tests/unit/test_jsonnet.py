@@ -2,12 +2,38 @@
 
 import json
 import subprocess
+import sys
 from pathlib import Path
 from unittest.mock import Mock
 
 import pytest
 
-from dogonnet.utils.jsonnet import compile_jsonnet, is_jsonnet_file, load_dashboard
+from dogonnet.utils.jsonnet import compile_dashboard, compile_jsonnet, is_jsonnet_file, load_dashboard, prepare_jsonnet
+
+
+@pytest.fixture(autouse=True)
+def clear_compile_cache():
+    """Keep tests hermetic by clearing the compile cache between tests."""
+    compile_jsonnet.cache_clear()
+    yield
+    compile_jsonnet.cache_clear()
+
+
+@pytest.fixture(autouse=True)
+def reset_jsonnet_backend(monkeypatch):
+    """Force the lazily resolved backend to re-resolve in every test."""
+    monkeypatch.setattr("dogonnet.utils.jsonnet._EVALUATE", None)
+
+
+@pytest.fixture
+def no_jsonnet_module(monkeypatch):
+    """Make the in-process binding imports fail so the CLI fallback is used.
+
+    A None entry in sys.modules raises ImportError at the cache check --
+    far cheaper and more targeted than wrapping builtins.__import__.
+    """
+    monkeypatch.setitem(sys.modules, "_jsonnet", None)
+    monkeypatch.setitem(sys.modules, "gojsonnet", None)
 
 
 def test_is_jsonnet_file():
@@ -18,9 +44,9 @@ def test_is_jsonnet_file():
     assert is_jsonnet_file(Path("test.txt")) is False
 
 
-def test_compile_basic_dashboard(basic_dashboard):
+def test_compile_basic_dashboard(basic_dashboard_compiled):
     """Test compiling the basic example dashboard."""
-    result = compile_jsonnet(basic_dashboard)
+    result = basic_dashboard_compiled
 
     # Verify it's valid JSON
     assert isinstance(result, dict)
@@ -55,6 +81,101 @@ def test_compile_with_external_vars(tmp_path):
     assert result["title"] == "Dashboard - production"
 
 
+def test_compile_cache_hit_on_unchanged_file(basic_dashboard):
+    """Test that recompiling an unchanged file is served from the cache."""
+    first = compile_jsonnet(basic_dashboard)
+    second = compile_jsonnet(basic_dashboard)
+
+    # Same content, but a fresh dict each time (cached results are immutable)
+    assert first == second
+    assert first is not second
+
+
+def test_compile_cache_clear(basic_dashboard):
+    """Test that cache_clear empties the compile cache."""
+    compile_jsonnet(basic_dashboard)
+    compile_jsonnet.cache_clear()
+
+    # Recompiles from scratch without error after clearing
+    result = compile_jsonnet(basic_dashboard)
+    assert result["title"] == "Basic Dashboard"
+
+
+def test_disk_cache_survives_memory_cache_clear(basic_dashboard, tmp_path):
+    """Test that the on-disk cache serves results after the in-memory cache is cleared."""
+    first = compile_jsonnet(basic_dashboard)
+
+    cache_dir = tmp_path / "compile-cache"
+    assert list(cache_dir.glob("*.json")), "expected a cache entry on disk"
+
+    compile_jsonnet.cache_clear()
+    second = compile_jsonnet(basic_dashboard)
+
+    assert first == second
+
+
+def test_disk_cache_invalidated_by_edited_import(tmp_path):
+    """Test that editing an imported library invalidates the on-disk cache."""
+    helper = tmp_path / "helper.libsonnet"
+    helper.write_text('{ title: "Before" }')
+    main_file = tmp_path / "main.jsonnet"
+    main_file.write_text('(import "helper.libsonnet") + { layout_type: "ordered", widgets: [] }')
+
+    assert compile_jsonnet(main_file)["title"] == "Before"
+
+    # Simulate a fresh process: drop the in-memory caches but keep the disk
+    # cache, then edit only the imported file (the source is unchanged)
+    compile_jsonnet.cache_clear()
+    helper.write_text('{ title: "After" }')
+
+    assert compile_jsonnet(main_file)["title"] == "After"
+
+
+def test_import_cache_revalidates_edited_library(tmp_path):
+    """Test that cached import bytes are refreshed when the library changes."""
+    helper = tmp_path / "helper.libsonnet"
+    helper.write_text('{ title: "Before" }')
+    main_file = tmp_path / "main.jsonnet"
+    main_file.write_text('(import "helper.libsonnet") + { layout_type: "ordered", widgets: [] }')
+
+    assert compile_jsonnet(main_file)["title"] == "Before"
+
+    # Edit both files without clearing anything: the compile caches genuinely
+    # miss, and the import byte cache must not serve the stale helper
+    helper.write_text('{ title: "After" }')
+    main_file.write_text('(import "helper.libsonnet") + { layout_type: "grid", widgets: [] }')
+
+    assert compile_jsonnet(main_file)["title"] == "After"
+
+
+def test_prepare_jsonnet_evaluates_with_varying_ext_vars(tmp_path):
+    """Test the parse-once evaluate-many entrypoint."""
+    test_file = tmp_path / "test.jsonnet"
+    test_file.write_text("""
+    local env = std.extVar('env');
+    {
+      title: 'Dashboard - ' + env,
+      layout_type: 'ordered',
+      widgets: [],
+    }
+    """)
+
+    evaluate = prepare_jsonnet(test_file)
+
+    assert evaluate({"env": "production"})["title"] == "Dashboard - production"
+    assert evaluate({"env": "staging"})["title"] == "Dashboard - staging"
+
+
+def test_compile_dashboard_lazy_dict(basic_dashboard):
+    """Test CompiledDashboard exposes raw JSON and a lazily parsed dict."""
+    compiled = compile_dashboard(basic_dashboard)
+
+    assert "Basic Dashboard" in compiled.json_str
+    assert compiled.data["title"] == "Basic Dashboard"
+    # Parsed once and reused
+    assert compiled.data is compiled.data
+
+
 def test_load_dashboard_jsonnet(basic_dashboard):
     """Test loading a Jsonnet dashboard."""
     result = load_dashboard(basic_dashboard)
@@ -84,98 +205,51 @@ def test_compile_invalid_jsonnet(tmp_path):
         compile_jsonnet(bad_file)
 
 
-def test_compile_with_cli_fallback(tmp_path, monkeypatch):
-    """Test compilation falls back to CLI when _jsonnet is not available."""
+def test_compile_with_cli_fallback(tmp_path, monkeypatch, no_jsonnet_module):
+    """Test compilation falls back to CLI when no in-process backend is available."""
     # Create test file
     test_file = tmp_path / "test.jsonnet"
     test_file.write_text('{ title: "Test", widgets: [] }')
 
-    # Force ImportError by removing _jsonnet from sys.modules if present
-    import sys
-
-    _jsonnet_backup = sys.modules.get("_jsonnet")
-    if "_jsonnet" in sys.modules:
-        del sys.modules["_jsonnet"]
-
     # Mock subprocess to return valid JSON
     mock_run = Mock()
     mock_result = Mock()
-    mock_result.stdout = '{"title": "Test", "widgets": []}'
+    mock_result.stdout = b'{"title": "Test", "widgets": []}'
     mock_run.return_value = mock_result
     monkeypatch.setattr("dogonnet.utils.jsonnet.subprocess.run", mock_run)
 
-    # Also make sure _jsonnet import fails
-    original_import = __import__
+    result = compile_jsonnet(test_file)
 
-    def mock_import(name, *args, **kwargs):
-        if name == "_jsonnet":
-            raise ImportError("No module named '_jsonnet'")
-        return original_import(name, *args, **kwargs)
+    assert result["title"] == "Test"
+    assert mock_run.called
+    # Verify jsonnet command was called with correct file
+    call_args = mock_run.call_args[0][0]
+    assert "jsonnet" in call_args
+    assert str(test_file) in call_args
 
-    monkeypatch.setattr("builtins.__import__", mock_import)
 
-    try:
-        result = compile_jsonnet(test_file)
-
-        assert result["title"] == "Test"
-        assert mock_run.called
-        # Verify jsonnet command was called with correct file
-        call_args = mock_run.call_args[0][0]
-        assert "jsonnet" in call_args
-        assert str(test_file) in call_args
-    finally:
-        # Restore _jsonnet if it was there
-        if _jsonnet_backup is not None:
-            sys.modules["_jsonnet"] = _jsonnet_backup
-
-
-def test_compile_cli_with_ext_vars(tmp_path, monkeypatch):
+def test_compile_cli_with_ext_vars(tmp_path, monkeypatch, no_jsonnet_module):
     """Test CLI fallback with external variables."""
-    import sys
-
-    _jsonnet_backup = sys.modules.get("_jsonnet")
-    if "_jsonnet" in sys.modules:
-        del sys.modules["_jsonnet"]
-
     test_file = tmp_path / "test.jsonnet"
     test_file.write_text('{ title: "Test" }')
 
     mock_run = Mock()
     mock_result = Mock()
-    mock_result.stdout = '{"title": "Test"}'
+    mock_result.stdout = b'{"title": "Test"}'
     mock_run.return_value = mock_result
     monkeypatch.setattr("dogonnet.utils.jsonnet.subprocess.run", mock_run)
 
-    original_import = __import__
+    compile_jsonnet(test_file, ext_vars={"env": "prod", "region": "us-west"})
 
-    def mock_import(name, *args, **kwargs):
-        if name == "_jsonnet":
-            raise ImportError("No module named '_jsonnet'")
-        return original_import(name, *args, **kwargs)
+    # Verify ext vars were passed correctly
+    call_args = mock_run.call_args[0][0]
+    assert "--ext-str" in call_args
+    assert "env=prod" in call_args
+    assert "region=us-west" in call_args
 
-    monkeypatch.setattr("builtins.__import__", mock_import)
 
-    try:
-        compile_jsonnet(test_file, ext_vars={"env": "prod", "region": "us-west"})
-
-        # Verify ext vars were passed correctly
-        call_args = mock_run.call_args[0][0]
-        assert "--ext-str" in call_args
-        assert "env=prod" in call_args
-        assert "region=us-west" in call_args
-    finally:
-        if _jsonnet_backup is not None:
-            sys.modules["_jsonnet"] = _jsonnet_backup
-
-
-def test_compile_cli_with_jpathdir(tmp_path, monkeypatch):
+def test_compile_cli_with_jpathdir(tmp_path, monkeypatch, no_jsonnet_module):
     """Test CLI fallback with jpath directories."""
-    import sys
-
-    _jsonnet_backup = sys.modules.get("_jsonnet")
-    if "_jsonnet" in sys.modules:
-        del sys.modules["_jsonnet"]
-
     test_file = tmp_path / "test.jsonnet"
     test_file.write_text('{ title: "Test" }')
     lib_dir = tmp_path / "lib"
@@ -183,39 +257,20 @@ def test_compile_cli_with_jpathdir(tmp_path, monkeypatch):
 
     mock_run = Mock()
     mock_result = Mock()
-    mock_result.stdout = '{"title": "Test"}'
+    mock_result.stdout = b'{"title": "Test"}'
     mock_run.return_value = mock_result
     monkeypatch.setattr("dogonnet.utils.jsonnet.subprocess.run", mock_run)
 
-    original_import = __import__
-
-    def mock_import(name, *args, **kwargs):
-        if name == "_jsonnet":
-            raise ImportError("No module named '_jsonnet'")
-        return original_import(name, *args, **kwargs)
-
-    monkeypatch.setattr("builtins.__import__", mock_import)
+    compile_jsonnet(test_file, jpathdir=[lib_dir])
 
-    try:
-        compile_jsonnet(test_file, jpathdir=[lib_dir])
+    # Verify jpath was passed correctly
+    call_args = mock_run.call_args[0][0]
+    assert "-J" in call_args
+    assert str(lib_dir) in call_args
 
-        # Verify jpath was passed correctly
-        call_args = mock_run.call_args[0][0]
-        assert "-J" in call_args
-        assert str(lib_dir) in call_args
-    finally:
-        if _jsonnet_backup is not None:
-            sys.modules["_jsonnet"] = _jsonnet_backup
 
-
-def test_compile_cli_not_found(tmp_path, monkeypatch):
+def test_compile_cli_not_found(tmp_path, monkeypatch, no_jsonnet_module):
     """Test error when jsonnet CLI is not installed."""
-    import sys
-
-    _jsonnet_backup = sys.modules.get("_jsonnet")
-    if "_jsonnet" in sys.modules:
-        del sys.modules["_jsonnet"]
-
     test_file = tmp_path / "test.jsonnet"
     test_file.write_text('{ title: "Test" }')
 
@@ -224,87 +279,36 @@ def test_compile_cli_not_found(tmp_path, monkeypatch):
     mock_run.side_effect = FileNotFoundError("jsonnet not found")
     monkeypatch.setattr("dogonnet.utils.jsonnet.subprocess.run", mock_run)
 
-    original_import = __import__
-
-    def mock_import(name, *args, **kwargs):
-        if name == "_jsonnet":
-            raise ImportError("No module named '_jsonnet'")
-        return original_import(name, *args, **kwargs)
-
-    monkeypatch.setattr("builtins.__import__", mock_import)
+    with pytest.raises(RuntimeError, match="Jsonnet compiler not found"):
+        compile_jsonnet(test_file)
 
-    try:
-        with pytest.raises(RuntimeError, match="Jsonnet compiler not found"):
-            compile_jsonnet(test_file)
-    finally:
-        if _jsonnet_backup is not None:
-            sys.modules["_jsonnet"] = _jsonnet_backup
 
-
-def test_compile_cli_compilation_error(tmp_path, monkeypatch):
+def test_compile_cli_compilation_error(tmp_path, monkeypatch, no_jsonnet_module):
     """Test CLI compilation error handling."""
-    import sys
-
-    _jsonnet_backup = sys.modules.get("_jsonnet")
-    if "_jsonnet" in sys.modules:
-        del sys.modules["_jsonnet"]
-
     test_file = tmp_path / "test.jsonnet"
     test_file.write_text("{ invalid }")
 
     # Mock CalledProcessError (compilation failed)
-    error = subprocess.CalledProcessError(1, "jsonnet", stderr="STATIC ERROR: syntax error")
+    error = subprocess.CalledProcessError(1, "jsonnet", stderr=b"STATIC ERROR: syntax error")
     mock_run = Mock()
     mock_run.side_effect = error
     monkeypatch.setattr("dogonnet.utils.jsonnet.subprocess.run", mock_run)
 
-    original_import = __import__
-
-    def mock_import(name, *args, **kwargs):
-        if name == "_jsonnet":
-            raise ImportError("No module named '_jsonnet'")
-        return original_import(name, *args, **kwargs)
-
-    monkeypatch.setattr("builtins.__import__", mock_import)
+    with pytest.raises(RuntimeError, match="Jsonnet compilation failed"):
+        compile_jsonnet(test_file)
 
-    try:
-        with pytest.raises(RuntimeError, match="Jsonnet compilation failed"):
-            compile_jsonnet(test_file)
-    finally:
-        if _jsonnet_backup is not None:
-            sys.modules["_jsonnet"] = _jsonnet_backup
 
-
-def test_compile_cli_invalid_json_output(tmp_path, monkeypatch):
+def test_compile_cli_invalid_json_output(tmp_path, monkeypatch, no_jsonnet_module):
     """Test error when CLI returns invalid JSON."""
-    import sys
-
-    _jsonnet_backup = sys.modules.get("_jsonnet")
-    if "_jsonnet" in sys.modules:
-        del sys.modules["_jsonnet"]
-
     test_file = tmp_path / "test.jsonnet"
     test_file.write_text('{ title: "Test" }')
 
     # Mock subprocess returning invalid JSON
     mock_run = Mock()
     mock_result = Mock()
-    mock_result.stdout = "not valid json {"
+    mock_result.stdout = b"not valid json {"
     mock_run.return_value = mock_result
     monkeypatch.setattr("dogonnet.utils.jsonnet.subprocess.run", mock_run)
 
-    original_import = __import__
-
-    def mock_import(name, *args, **kwargs):
-        if name == "_jsonnet":
-            raise ImportError("No module named '_jsonnet'")
-        return original_import(name, *args, **kwargs)
-
-    monkeypatch.setattr("builtins.__import__", mock_import)
-
-    try:
-        with pytest.raises(RuntimeError, match="Invalid JSON output from Jsonnet"):
-            compile_jsonnet(test_file)
-    finally:
-        if _jsonnet_backup is not None:
-            sys.modules["_jsonnet"] = _jsonnet_backup
+    with pytest.raises(RuntimeError, match="Invalid JSON output from Jsonnet"):
+        compile_jsonnet(test_file)